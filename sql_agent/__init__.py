@@ -1,9 +1,13 @@
 from .database import SQLDatabase
 from .agent import SQLAgent
+from .history import HistoryStore, InMemoryHistoryStore, RedisHistoryStore
 
 __version__ = "0.1.0"
 
 __all__ = [
     "SQLDatabase",
     "SQLAgent",
+    "HistoryStore",
+    "InMemoryHistoryStore",
+    "RedisHistoryStore",
 ]
\ No newline at end of file
@@ -2,19 +2,51 @@
 SQLAgent - Natural language interface for SQL database operations using OpenAI.
 """
 
-from typing import Dict, List, Any
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
+import asyncio
+import httpx
 import openai
 import os
 import json
 from jinja2 import Environment, FileSystemLoader
 from .database import SQLDatabase
+from .history import HistoryStore, InMemoryHistoryStore
 from .tools import get_sql_tools
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# The system prompt takes no variables, so compile and render it once at import
+_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'templates')
+_JINJA_ENV = Environment(loader=FileSystemLoader(_TEMPLATE_DIR), auto_reload=False, cache_size=400)
+_SYSTEM_PROMPT = _JINJA_ENV.get_template('system_prompt.j2').render()
+
+# One OpenAI client per process so agents share pooled keep-alive connections
+_SHARED_CLIENT: Optional[openai.AsyncOpenAI] = None
+
+
+def get_client() -> openai.AsyncOpenAI:
+    """Return the process-wide AsyncOpenAI client, creating it on first use."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None:
+        _SHARED_CLIENT = openai.AsyncOpenAI(
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            )
+        )
+    return _SHARED_CLIENT
+
 
 class SQLAgentResponseWrapper:
     """Wrapper for SQLAgentResponse that provides backward compatibility with history access."""
     
     def __init__(self, response: str, history: List[Dict[str, Any]]):
+        # History is append-only within a run, so share the list instead of copying it
         self.response = response
         self._history = history
     
@@ -22,9 +54,9 @@ class SQLAgentResponseWrapper:
         return self.response
     
     @property
-    def history(self) -> List[Dict[str, Any]]:
-        """Access the conversation history as full OpenAI messages array."""
-        return self._history
+    def history(self) -> Tuple[Dict[str, Any], ...]:
+        """Access the conversation history as full OpenAI messages array (read-only snapshot)."""
+        return tuple(self._history)
 
 
 
@@ -35,7 +67,11 @@ class SQLAgent:
     Provides an async conversational interface to SQL database operations with history management.
     """
     
-    def __init__(self, db: SQLDatabase, thread_id: str, model: str = "gpt-4.1-mini"):
+    # Shared by every agent that is not given its own history store
+    _default_history_store: HistoryStore = InMemoryHistoryStore()
+    
+    def __init__(self, db: SQLDatabase, thread_id: str, model: str = "gpt-4.1-mini",
+                 history_store: Optional[HistoryStore] = None):
         """
         Initialize SQLAgent with database connection and conversation settings.
         
@@ -43,25 +79,92 @@ class SQLAgent:
             db: SQLDatabase instance for database operations
             thread_id: Unique identifier for conversation thread
             model: Model provider string (e.g., "openai/gpt-4.1-mini")
+            history_store: Conversation history backend; defaults to a bounded
+                in-memory store shared by all agents in the process
         """
         self.db = db
         self.thread_id = thread_id
         self.model = model
-
-        # Initialize Jinja2 template environment
-        template_dir = os.path.join(os.path.dirname(__file__), 'templates')
-        self.jinja_env = Environment(loader=FileSystemLoader(template_dir))
         
-        # Initialize AsyncOpenAI client
-        self.client = openai.AsyncOpenAI()
+        self.history_store = SQLAgent._default_history_store if history_store is None else history_store
+        
+        # Tool schema is static, so reuse the same object on every turn
+        self._tools = get_sql_tools()
+        
+        # Map tool names to handlers taking the parsed tool arguments
+        self._tool_dispatch = {
+            "sql_db_list_tables": lambda args: self.db.sql_db_list_tables(""),
+            "sql_db_overview": lambda args: self.db.sql_db_overview(""),
+            "sql_db_schema": lambda args: self.db.sql_db_schema(args.get("tables", "")),
+            "sql_db_query_checker": lambda args: self.db.sql_db_query_checker(args.get("query", "")),
+            "sql_db_query": lambda args: self.db.sql_db_query(args.get("query", "")),
+        }
+        
+        # Thread-bound databases (e.g. in-memory SQLite) must run tools on the loop thread
+        self._run_tools_inline = getattr(self.db, "thread_bound", False)
+        
+        # Reuse the shared AsyncOpenAI client
+        self.client = get_client()
+    
+    def _exec_tool(self, function_name: str, function_args: Dict[str, Any]) -> str:
+        """Execute a single tool call against the database (blocking)."""
+        handler = self._tool_dispatch.get(function_name)
+        if handler is None:
+            return f"Unknown function: {function_name}"
+        return handler(function_args)
+    
+    async def _dispatch(self, tool_call: Dict[str, Any]) -> str:
+        """Run a tool call in the default executor so it does not block the event loop."""
+        function_name = tool_call["function"]["name"]
+        function_args = _json_loads(tool_call["function"]["arguments"] or "{}")
+        
+        if self._run_tools_inline:
+            return self._exec_tool(function_name, function_args)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._exec_tool, function_name, function_args)
+    
+    @classmethod
+    async def run_many(cls, db: SQLDatabase, queries: List[Tuple[str, str]], concurrency: int = 20,
+                       max_iterations: int = 10, **agent_kwargs: Any) -> List[SQLAgentResponseWrapper]:
+        """
+        Run independent queries concurrently, one agent per thread.
         
-        # Conversation history storage (in-memory for now)
-        if not hasattr(SQLAgent, '_conversations'):
-            SQLAgent._conversations = {}
+        Args:
+            db: SQLDatabase instance shared by all agents
+            queries: (thread_id, user_query) pairs; thread_ids should be distinct
+                since concurrent turns on one thread would race on its history
+            concurrency: Maximum number of queries in flight at once
+            max_iterations: Maximum number of tool iterations per query
+            **agent_kwargs: Extra SQLAgent arguments (e.g. model, history_store)
+            
+        Returns:
+            Responses in the same order as `queries`
+        """
+        semaphore = asyncio.Semaphore(concurrency)
         
-        if thread_id not in SQLAgent._conversations:
-            SQLAgent._conversations[thread_id] = []
+        async def bounded(thread_id: str, user_query: str) -> SQLAgentResponseWrapper:
+            async with semaphore:
+                agent = cls(db, thread_id, **agent_kwargs)
+                return await agent.run(user_query, max_iterations=max_iterations)
+        
+        return await asyncio.gather(
+            *(bounded(thread_id, user_query) for thread_id, user_query in queries)
+        )
     
+    def _build_messages(self, history: List[Dict[str, Any]], user_query: str) -> List[Dict[str, Any]]:
+        """
+        Build the request messages as [system] + committed history + [user].
+        
+        Committed turns are never rewritten, so each request starts with the same
+        bytes as the previous one and hits the provider's prompt prefix cache.
+        """
+        messages = list(history) if history else [{"role": "system", "content": _SYSTEM_PROMPT}]
+        messages.append({
+            "role": "user",
+            "content": user_query
+        })
+        return messages
     
     async def run(self, user_query: str, max_iterations: int = 10) -> SQLAgentResponseWrapper:
         """
@@ -77,118 +180,176 @@ class SQLAgent:
         Returns:
             SQLAgentResponse object with the final response
         """
-        # Load existing conversation history
-        if self.thread_id not in SQLAgent._conversations:
-            SQLAgent._conversations[self.thread_id] = []
-        
-        messages = SQLAgent._conversations[self.thread_id].copy()
-        
-        # Add system prompt if this is a new conversation
-        if not messages:
-            system_template = self.jinja_env.get_template('system_prompt.j2')
-            system_content = system_template.render()
-            messages.append({
-                "role": "system", 
-                "content": system_content
-            })
-        
-        # Add current user query to messages
-        user_message = {
-            "role": "user",
-            "content": user_query
-        }
-        messages.append(user_message)
-        
-        # Get SQL tools from tools module
-        tools = get_sql_tools()
-        
-        
-        # Iterative tool usage loop
-        iteration = 0
-        while iteration < max_iterations:
-            try:
-                # Get response with tool calls from OpenAI
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    tools=tools,
-                    tool_choice="auto"
-                )
-                
-                assistant_message = response.choices[0].message
-                
-                # If no tool calls, check if it's a final response
-                if not assistant_message.tool_calls:
-                    if assistant_message.content:
-                        # Add final response to messages
-                        final_message = {
-                            "role": "assistant",
-                            "content": assistant_message.content
-                        }
-                        messages.append(final_message)
+        # Load existing conversation history and append the new turn
+        history = await self.history_store.load(self.thread_id)
+        messages = self._build_messages(history, user_query)
+        
+        async for _ in self._stream_turn(messages, max_iterations):
+            pass
+        
+        # The final assistant message holds the response (answer, error or timeout)
+        return SQLAgentResponseWrapper(messages[-1]["content"], messages)
+    
+    async def stream(self, user_query: str, max_iterations: int = 10) -> AsyncIterator[str]:
+        """
+        Process a natural language query, yielding assistant text as it is generated.
+        
+        Args:
+            user_query: Natural language query from the user
+            max_iterations: Maximum number of tool iterations before stopping
+            
+        Yields:
+            Chunks of assistant text as generated. Text the model writes alongside
+            tool calls is streamed too, and each model turn's text is separated
+            from the previous one by a blank line. The last chunks are the final
+            response (or the error/timeout message). If iteration stops early,
+            the user message and any finished tool rounds are still saved.
+        """
+        # Load existing conversation history and append the new turn
+        history = await self.history_store.load(self.thread_id)
+        messages = self._build_messages(history, user_query)
+        
+        # Close the inner loop as soon as the consumer stops, so it persists right away
+        turn = self._stream_turn(messages, max_iterations)
+        try:
+            async for text in turn:
+                yield text
+        finally:
+            await turn.aclose()
+    
+    async def _stream_turn(self, messages: List[Dict[str, Any]], max_iterations: int) -> AsyncIterator[str]:
+        """Run the tool loop on `messages` in place, yielding text deltas, and persist what completed."""
+        # Only complete exchanges are persisted: the user message, finished tool
+        # rounds and the final assistant message. If the consumer stops early, the
+        # partial turn is dropped but everything before it is still saved.
+        committed = len(messages)
+        try:
+            # Iterative tool usage loop
+            iteration = 0
+            empty_turns = 0
+            # Whether text has been yielded yet, so later turns can be separated from it
+            streamed_text = False
+            while iteration < max_iterations:
+                try:
+                    # Stream the response from OpenAI, reassembling tool calls from their deltas
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        tools=self._tools,
+                        tool_choice="auto",
+                        stream=True
+                    )
+                    
+                    content_parts: List[str] = []
+                    tool_calls: Dict[int, Dict[str, Any]] = {}
+                    separator = "\n\n" if streamed_text else ""
+                    
+                    async for chunk in response:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta
+                        
+                        if delta.content:
+                            if not content_parts and separator:
+                                yield separator
+                            content_parts.append(delta.content)
+                            streamed_text = True
+                            yield delta.content
                         
-                        # Persist complete conversation
-                        SQLAgent._conversations[self.thread_id] = messages
-                        return SQLAgentResponseWrapper(assistant_message.content, messages.copy())
-                    else:
-                        # Model didn't provide content or tool calls
-                        continue
-                
-                # Add assistant message with tool calls
-                messages.append({
-                    "role": "assistant", 
-                    "tool_calls": [tool_call.model_dump() for tool_call in assistant_message.tool_calls]
-                })
-                
-                # Execute each tool call
-                for tool_call in assistant_message.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
+                        for tool_call_delta in delta.tool_calls or ():
+                            tool_call = tool_calls.get(tool_call_delta.index)
+                            if tool_call is None:
+                                tool_call = tool_calls[tool_call_delta.index] = {
+                                    "id": tool_call_delta.id,
+                                    "type": "function",
+                                    "function": {"name": "", "arguments": ""}
+                                }
+                            if tool_call_delta.id:
+                                tool_call["id"] = tool_call_delta.id
+                            function = tool_call_delta.function
+                            if function is not None:
+                                if function.name:
+                                    tool_call["function"]["name"] += function.name
+                                if function.arguments:
+                                    tool_call["function"]["arguments"] += function.arguments
                     
-                    # Execute the appropriate database operation
-                    if function_name == "sql_db_list_tables":
-                        result = self.db.sql_db_list_tables("")
-                    elif function_name == "sql_db_schema":
-                        result = self.db.sql_db_schema(function_args.get("tables", ""))
-                    elif function_name == "sql_db_query_checker":
-                        result = self.db.sql_db_query_checker(function_args.get("query", ""))
-                    elif function_name == "sql_db_query":
-                        result = self.db.sql_db_query(function_args.get("query", ""))
-                    else:
-                        result = f"Unknown function: {function_name}"
+                    # If no tool calls, check if it's a final response
+                    if not tool_calls:
+                        if content_parts:
+                            # Add final response to messages
+                            final_message = {
+                                "role": "assistant",
+                                "content": "".join(content_parts)
+                            }
+                            messages.append(final_message)
+                            committed = len(messages)
+                            return
+                        else:
+                            # Model didn't provide content or tool calls; count it as a step
+                            # and give up after repeated empty turns
+                            empty_turns += 1
+                            iteration += 1
+                            if empty_turns >= 2:
+                                break
+                            continue
                     
-                    # Add tool result message
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": str(result)
-                    })
-                
-                iteration += 1
-                
-            except Exception as e:
-                # If there's an error, return it as the final response
-                error_message = f"I encountered an error while processing your query: {str(e)}"
-                
-                error_response = {
-                    "role": "assistant", 
-                    "content": error_message
-                }
-                messages.append(error_response)
-                
-                # Persist complete conversation  
-                SQLAgent._conversations[self.thread_id] = messages
-                return SQLAgentResponseWrapper(error_message, messages.copy())
-        
-        # If max iterations reached without final response
-        timeout_message = "I've reached the maximum number of steps while processing your query. Please try rephrasing your question or breaking it into smaller parts."
-        
-        timeout_response = {
-            "role": "assistant",
-            "content": timeout_message
-        }
-        messages.append(timeout_response)
-        
-        # Persist complete conversation
-        SQLAgent._conversations[self.thread_id] = messages
-        return SQLAgentResponseWrapper(timeout_message, messages.copy())
\ No newline at end of file
+                    ordered_tool_calls = [tool_calls[index] for index in sorted(tool_calls)]
+                    
+                    # Add assistant message with tool calls, keeping any text streamed with them
+                    tool_call_message: Dict[str, Any] = {
+                        "role": "assistant", 
+                        "tool_calls": ordered_tool_calls
+                    }
+                    if content_parts:
+                        tool_call_message["content"] = "".join(content_parts)
+                    messages.append(tool_call_message)
+                    
+                    # Execute tool calls concurrently, keeping results in call order
+                    results = await asyncio.gather(
+                        *(self._dispatch(tool_call) for tool_call in ordered_tool_calls)
+                    )
+                    
+                    for tool_call, result in zip(ordered_tool_calls, results):
+                        # Add tool result message
+                        messages.append({
+                            "role": "tool",
+                            "tool_call_id": tool_call["id"],
+                            "content": str(result)
+                        })
+                    committed = len(messages)
+                    
+                    iteration += 1
+                    
+                except Exception as e:
+                    # If there's an error, return it as the final response
+                    error_message = f"I encountered an error while processing your query: {str(e)}"
+                    
+                    error_response = {
+                        "role": "assistant", 
+                        "content": error_message
+                    }
+                    messages.append(error_response)
+                    committed = len(messages)
+                    
+                    if streamed_text:
+                        yield "\n\n"
+                    yield error_message
+                    return
+            
+            # If max iterations reached without final response
+            timeout_message = "I've reached the maximum number of steps while processing your query. Please try rephrasing your question or breaking it into smaller parts."
+            
+            timeout_response = {
+                "role": "assistant",
+                "content": timeout_message
+            }
+            messages.append(timeout_response)
+            committed = len(messages)
+            
+            if streamed_text:
+                yield "\n\n"
+            yield timeout_message
+        finally:
+            await self.history_store.save(
+                self.thread_id, messages if committed == len(messages) else messages[:committed]
+            )
\ No newline at end of file
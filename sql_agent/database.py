@@ -1,21 +1,104 @@
 import sqlparse
-from sqlalchemy import create_engine, text, inspect
+from functools import lru_cache
+from itertools import chain
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy import column as sa_column, table as sa_table
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Optional, Any, List
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
+from typing import Optional, Any, Dict, List
 import logging
 
 
+def _pool_options(database_uri: str, pool_size: int, max_overflow: int) -> Dict[str, Any]:
+    """
+    Build connection pool options for create_engine.
+    
+    Sizing only applies to queue-based pools; dialects that default to other
+    pools (e.g. in-memory SQLite) reject pool_size/max_overflow.
+    """
+    options: Dict[str, Any] = {"pool_pre_ping": True, "pool_recycle": 1800}
+    
+    url = make_url(database_uri)
+    if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+        options["pool_size"] = pool_size
+        options["max_overflow"] = max_overflow
+    
+    return options
+
+
+def _is_thread_bound(engine: Any) -> bool:
+    """
+    Whether an engine's connections must only be used from the thread that made them.
+    
+    In-memory SQLite pools give each thread its own (empty) database or share a
+    single connection, so work cannot be spread across executor threads.
+    """
+    return isinstance(engine.pool, (SingletonThreadPool, StaticPool))
+
+
+def _format_value(value: Any) -> str:
+    """Render a single cell value, using NULL for missing values."""
+    return "NULL" if value is None else str(value)
+
+
+def _format_row(row: Any) -> str:
+    """Render a result row as a pipe-separated line."""
+    return " | ".join(map(_format_value, row))
+
+
+def _format_column(column: Dict[str, Any]) -> str:
+    """Render inspector column metadata as a schema listing line."""
+    nullable = "NULL" if column['nullable'] else "NOT NULL"
+    default = f" DEFAULT {column['default']}" if column['default'] is not None else ""
+    return f"  - {column['name']}: {column['type']} {nullable}{default}"
+
+
+@lru_cache(maxsize=256)
+def _check_query_syntax(query: str) -> str:
+    """Validate a stripped, non-empty query; cached since the agent often re-checks the same SQL."""
+    # Parse the SQL query using sqlparse
+    parsed = sqlparse.parse(query)
+    
+    if not parsed:
+        return "Error: Unable to parse the SQL query."
+    
+    statement = parsed[0]
+    
+    # Check if it's a valid SQL statement
+    if statement.get_type() == 'UNKNOWN':
+        return "Error: Unable to determine query type - invalid SQL syntax."
+    
+    return "✓ Query syntax is valid."
+
+
 class SQLDatabase:
-    def __init__(self, database_uri: str):
+    def __init__(self, database_uri: str, pool_size: int = 10, max_overflow: int = 20):
         """
         Initialize SQLDatabase with a database connection URI.
         
         Args:
             database_uri: Database connection string (e.g., "sqlite:///database.db")
+            pool_size: Number of connections kept open in the pool
+            max_overflow: Extra connections allowed beyond pool_size under load
         """
         self.database_uri = database_uri
-        self.engine = create_engine(database_uri)
+        self.engine = create_engine(
+            database_uri,
+            query_cache_size=1200,
+            **_pool_options(database_uri, pool_size, max_overflow)
+        )
         self._test_connection()
+        
+        # Schema metadata cache; call invalidate_schema_cache() after running DDL
+        self._inspector = inspect(self.engine)
+        self._table_names_cache: Optional[List[str]] = None
+        self._columns_cache: Dict[str, List[Dict[str, Any]]] = {}
+    
+    @property
+    def thread_bound(self) -> bool:
+        """Whether database calls must stay on a single thread (e.g. in-memory SQLite)."""
+        return _is_thread_bound(self.engine)
     
     def _test_connection(self) -> None:
         """Test the database connection on initialization."""
@@ -25,6 +108,40 @@ class SQLDatabase:
         except SQLAlchemyError as e:
             raise ConnectionError(f"Failed to connect to database: {str(e)}")
     
+    def _refresh_tables(self) -> List[str]:
+        """Reload the table names from the database catalog."""
+        self._table_names_cache = self._inspector.get_table_names()
+        return self._table_names_cache
+    
+    def _get_columns(self, table_name: str) -> List[Dict[str, Any]]:
+        """Return column metadata for a table, loading it from the catalog once."""
+        columns = self._columns_cache.get(table_name)
+        if columns is None:
+            columns = self._columns_cache[table_name] = self._inspector.get_columns(table_name)
+        return columns
+    
+    def _load_columns(self, table_names: List[str]) -> None:
+        """Load column metadata for uncached tables, in one catalog query where supported."""
+        missing = [name for name in table_names if name not in self._columns_cache]
+        if not missing:
+            return
+        
+        # Inspector.get_multi_columns is only available on SQLAlchemy 2.0+
+        get_multi_columns = getattr(self._inspector, "get_multi_columns", None)
+        if get_multi_columns is None:
+            for table_name in missing:
+                self._get_columns(table_name)
+            return
+        
+        for (_, table_name), columns in get_multi_columns(filter_names=missing).items():
+            self._columns_cache[table_name] = columns
+    
+    def invalidate_schema_cache(self) -> None:
+        """Drop cached table and column metadata, e.g. after running DDL."""
+        self._inspector = inspect(self.engine)
+        self._table_names_cache = None
+        self._columns_cache = {}
+    
     def sql_db_query(self, query: str) -> str:
         """
         Execute a SQL query and return the results.
@@ -41,22 +158,22 @@ class SQLDatabase:
                 
                 # Handle different types of queries
                 if result.returns_rows:
-                    rows = result.fetchall()
-                    if not rows:
+                    # Stream rows from the cursor instead of materializing them all
+                    first_row = next(iter(result), None)
+                    if first_row is None:
                         return "No rows returned."
                     
                     # Get column names
-                    columns = list(result.keys())
+                    header = " | ".join(result.keys())
                     
                     # Format results as a table
-                    formatted_result = []
-                    formatted_result.append(" | ".join(columns))
-                    formatted_result.append("-" * len(formatted_result[0]))
-                    
-                    for row in rows:
-                        formatted_result.append(" | ".join(str(value) if value is not None else "NULL" for value in row))
+                    def _lines():
+                        yield header
+                        yield "-" * len(header)
+                        for row in chain((first_row,), result):
+                            yield _format_row(row)
                     
-                    return "\n".join(formatted_result)
+                    return "\n".join(_lines())
                 else:
                     # For INSERT, UPDATE, DELETE operations
                     rowcount = result.rowcount
@@ -78,8 +195,7 @@ class SQLDatabase:
             Comma-separated list of table names
         """
         try:
-            inspector = inspect(self.engine)
-            tables = inspector.get_table_names()
+            tables = self._table_names_cache or self._refresh_tables()
             
             if not tables:
                 return "No tables found in the database."
@@ -91,6 +207,37 @@ class SQLDatabase:
         except Exception as e:
             return f"Unexpected error: {str(e)}"
     
+    def sql_db_overview(self, empty_input: str = "") -> str:
+        """
+        List every table with its columns in a single tool call.
+        
+        Args:
+            empty_input: Unused parameter (for compatibility with description)
+            
+        Returns:
+            Column listing for each table, without sample rows
+        """
+        try:
+            tables = self._table_names_cache or self._refresh_tables()
+            
+            if not tables:
+                return "No tables found in the database."
+            
+            self._load_columns(tables)
+            
+            result_parts = []
+            for table_name in tables:
+                table_info = [f"Table: {table_name}", "Columns:"]
+                table_info.extend(map(_format_column, self._get_columns(table_name)))
+                result_parts.append("\n".join(table_info))
+            
+            return "\n\n".join(result_parts)
+            
+        except SQLAlchemyError as e:
+            return f"Error retrieving database overview: {str(e)}"
+        except Exception as e:
+            return f"Unexpected error: {str(e)}"
+    
     def sql_db_schema(self, tables: str) -> str:
         """
         Get schema information and sample rows for specified tables.
@@ -107,8 +254,7 @@ class SQLDatabase:
             if not table_list:
                 return "No tables specified."
             
-            inspector = inspect(self.engine)
-            all_tables = inspector.get_table_names()
+            all_tables = self._table_names_cache or self._refresh_tables()
             
             result_parts = []
             
@@ -118,21 +264,19 @@ class SQLDatabase:
                     continue
                 
                 # Get column information
-                columns = inspector.get_columns(table_name)
+                columns = self._get_columns(table_name)
                 
                 schema_info = [f"\nTable: {table_name}"]
                 schema_info.append("Columns:")
                 
-                for column in columns:
-                    col_type = str(column['type'])
-                    nullable = "NULL" if column['nullable'] else "NOT NULL"
-                    default = f" DEFAULT {column['default']}" if column['default'] is not None else ""
-                    schema_info.append(f"  - {column['name']}: {col_type} {nullable}{default}")
+                schema_info.extend(map(_format_column, columns))
                 
                 # Get sample rows
                 try:
                     with self.engine.connect() as conn:
-                        sample_result = conn.execute(text(f"SELECT * FROM {table_name} LIMIT 3"))
+                        # Build the preview from cached column metadata so names are quoted, not interpolated
+                        preview = sa_table(table_name, *(sa_column(col['name']) for col in columns))
+                        sample_result = conn.execute(select(preview).limit(3))
                         sample_rows = sample_result.fetchall()
                         
                         if sample_rows:
@@ -142,7 +286,7 @@ class SQLDatabase:
                             schema_info.append("-" * len(schema_info[-1]))
                             
                             for row in sample_rows:
-                                schema_info.append(" | ".join(str(value) if value is not None else "NULL" for value in row))
+                                schema_info.append(_format_row(row))
                         else:
                             schema_info.append("\nNo sample rows available (table is empty).")
                 
@@ -169,22 +313,11 @@ class SQLDatabase:
             Syntax validation results
         """
         try:
-            if not query or not query.strip():
+            query = query.strip() if query else ""
+            if not query:
                 return "Error: Empty query provided."
             
-            # Parse the SQL query using sqlparse
-            parsed = sqlparse.parse(query.strip())
-            
-            if not parsed:
-                return "Error: Unable to parse the SQL query."
-            
-            statement = parsed[0]
-            
-            # Check if it's a valid SQL statement
-            if statement.get_type() == 'UNKNOWN':
-                return "Error: Unable to determine query type - invalid SQL syntax."
-            
-            return "✓ Query syntax is valid."
+            return _check_query_syntax(query)
             
         except Exception as e:
             return f"Error validating query syntax: {str(e)}"
\ No newline at end of file
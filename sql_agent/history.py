@@ -0,0 +1,94 @@
+"""
+Conversation history storage backends for SQLAgent.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+import json
+
+from cachetools import TTLCache
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+
+class HistoryStore(ABC):
+    """Storage backend for per-thread conversation history (OpenAI messages arrays)."""
+    
+    @abstractmethod
+    async def load(self, thread_id: str) -> List[Dict[str, Any]]:
+        """
+        Load the messages for a conversation thread.
+        
+        Args:
+            thread_id: Unique identifier for conversation thread
+            
+        Returns:
+            Stored messages, or an empty list for an unknown thread
+        """
+    
+    @abstractmethod
+    async def save(self, thread_id: str, messages: List[Dict[str, Any]]) -> None:
+        """
+        Persist the complete messages for a conversation thread.
+        
+        Args:
+            thread_id: Unique identifier for conversation thread
+            messages: Full OpenAI messages array for the thread
+        """
+
+
+class InMemoryHistoryStore(HistoryStore):
+    """Bounded in-process history store; idle threads expire after `ttl` seconds."""
+    
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+    
+    async def load(self, thread_id: str) -> List[Dict[str, Any]]:
+        return self._cache.get(thread_id, [])
+    
+    async def save(self, thread_id: str, messages: List[Dict[str, Any]]) -> None:
+        self._cache[thread_id] = messages
+
+
+class RedisHistoryStore(HistoryStore):
+    """History store backed by Redis, shareable across processes."""
+    
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl: Optional[int] = 3600,
+                 key_prefix: str = "sqlagent:"):
+        """
+        Initialize RedisHistoryStore.
+        
+        Args:
+            url: Redis connection URL
+            ttl: Expiry in seconds for each thread's history, or None to keep forever
+            key_prefix: Prefix for the per-thread Redis keys
+        """
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise ImportError(
+                "RedisHistoryStore requires the 'redis' package. "
+                "Install it with `pip install sql-agent[redis]`."
+            )
+        
+        self._redis = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+    
+    def _key(self, thread_id: str) -> str:
+        return f"{self.key_prefix}{thread_id}"
+    
+    async def load(self, thread_id: str) -> List[Dict[str, Any]]:
+        data = await self._redis.get(self._key(thread_id))
+        if data is None:
+            return []
+        return _json_loads(data)
+    
+    async def save(self, thread_id: str, messages: List[Dict[str, Any]]) -> None:
+        await self._redis.set(self._key(thread_id), _json_dumps(messages), ex=self.ttl)